@@ -13,12 +13,14 @@ class APIHandler:
     accessToken: str
     broadcasterID: str
 
-    # Init for the class. Calls for logging init and checks the access token.
-    def __init__(self, clientID: str, accessToken: str, broadcasterID: str):
+    # Init for the class. Checks the access token unless validate is False,
+    # in which case the caller is responsible for calling checkaccesstoken().
+    def __init__(self, clientID: str, accessToken: str, broadcasterID: str, validate: bool = True):
         self.clientID = clientID
         self.accessToken = accessToken
         self.broadcasterID = broadcasterID
-        self.checkaccesstoken()
+        if validate:
+            self.checkaccesstoken()
 
     # Checks if our access token is still valid. Will prompt the user to create a new one if needed.
     def checkaccesstoken(self):
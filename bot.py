@@ -5,15 +5,49 @@ import configparser
 import logging
 import sys
 import asyncio
-from typing import Set, Dict, Any
+import time
+import copy
+import threading
+from types import MappingProxyType
+from typing import Set, Dict, List, Any, Optional, FrozenSet, Mapping
 from datetime import date
+import requests
 from twitchio.ext import commands
 
 import apihandler
 from apihandler import APIHandler
+import history
+from history import GiveawayHistory
 
 logger = logging.getLogger(__name__)
 
+SETTINGS_FILENAME = 'settings.ini'
+TOKEN_CHECK_ATTEMPTS = 3
+TOKEN_CHECK_RETRY_DELAY = 5
+
+
+# Writes a single value back to the settings file.
+# Edits the line in place so the comments in settings.ini are kept.
+def save_setting(section: str, key: str, value: str, filename: str = SETTINGS_FILENAME) -> None:
+    logger.info(f'Saving {key} to "{filename}"')
+    with open(filename, 'r') as _file:
+        lines = _file.readlines()
+
+    current_section = ''
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('[') and stripped.endswith(']'):
+            current_section = stripped[1:-1]
+        elif current_section == section and stripped.split('=', 1)[0].strip().lower() == key.lower():
+            lines[i] = f'{key}={value}\n'
+            break
+    else:
+        logger.warning(f'Could not find {key} in "{filename}". Skipping save.')
+        return
+
+    with open(filename, 'w') as _file:
+        _file.writelines(lines)
+
 
 # Ignorelist of users that are not allowed to participate in giveaways.
 class IgnoreList:
@@ -89,6 +123,22 @@ class User:
         self.since_last_win = since_last_win
         self.id = f'{userid}'
 
+    # Returns a copy of the user. Users in the scoreboard are never changed in place,
+    # a changed copy replaces them so snapshots stay consistent.
+    def copy(self) -> 'User':
+        return copy.copy(self)
+
+
+# Immutable view of the scoreboard at a given version.
+# Safe to read without holding a lock, eg. while saving in a background thread.
+class ScoreboardSnapshot:
+    version: int
+    users: Mapping[str, User]
+
+    def __init__(self, version: int, users: Dict[str, User]):
+        self.version = version
+        self.users = MappingProxyType(users)
+
 
 # Scoreboard that keeps track of all users who have ever participated.
 # Is loaded from a file when the program starts.
@@ -101,6 +151,7 @@ class Scoreboard:
     TIER2_LUCK: int
     TIER3_LUCK: int
     SKIP_PUNISHMENT: int
+    version: int
 
     def __init__(self, bump: int, tier1: int, tier2: int, tier3: int, skip_punishment, api: APIHandler, filename=None):
         self.FILENAME = filename or 'scoreboard.txt'
@@ -111,15 +162,27 @@ class Scoreboard:
         self.SKIP_PUNISHMENT = skip_punishment
         self.API = api
         self.scoreboard = {}
+        self.version = 0
+        self._snapshot = None
+        self._saved_version = -1
+        self._save_lock = threading.Lock()
 
     # Load the scoreboard from a file.
     def load(self):
+        scoreboard = self.read()
+        if scoreboard is not None:
+            self.replace(scoreboard)
+
+    # Reads the scoreboard from a file without changing the current scoreboard.
+    # Returns None if there is no file or it could not be read.
+    # Safe to call from a background thread, use replace() on the event loop to swap it in.
+    def read(self) -> Optional[Dict[str, User]]:
         logger.info('Loading scoreboard...')
 
         if not os.path.isfile(self.FILENAME):
             logger.warning('Could not find file!')
             logger.info('Creating new scoreboard.')
-            return
+            return None
 
         scoreboard = {}
         try:
@@ -132,43 +195,75 @@ class Scoreboard:
                         scoreboard[name.lower()] = User(name=name, luck=int(luck),
                                                         tier=int(tier), lifetime=int(lifetime),
                                                         since_last_win=int(since_last_win), userid=userID)
-            self.scoreboard = scoreboard
 
         except Exception as e:
-            logger.warning(f'Fail to load "{self.FILENAME}":', e)
+            logger.warning(f'Fail to load "{self.FILENAME}": {e}')
+            return None
 
         logger.debug("Scoreboard - Name : Luck")
         for user in scoreboard.values():
             logger.debug(f'{user.name} : {user.luck}')
+        return scoreboard
 
-    # Save the scoreboard to a file.
-    def save(self):
-        logger.info(f'Saving scoreboard to "{self.FILENAME}"')
-
-        with open(self.FILENAME, 'w', newline='') as _file:
-            _writer = csv.writer(_file, delimiter=' ', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            _writer.writerow((["Username", "Luck", "Tier", "Lifetime", "Since last win", "ID"]))
-            for user in self.scoreboard.values():
-                _writer.writerow([user.name, user.luck, user.tier, user.lifetime, user.since_last_win, user.id])
+    # Replaces the whole scoreboard and bumps the version.
+    def replace(self, scoreboard: Dict[str, User]) -> None:
+        self.scoreboard = scoreboard
+        self.version += 1
+
+    # Returns an immutable snapshot of the scoreboard. A new snapshot is only made if the scoreboard has changed.
+    # Copies the whole scoreboard, so it is only used once per round (close, draw and save).
+    # Single users can be read directly with getuser since users are replaced instead of changed.
+    def snapshot(self) -> ScoreboardSnapshot:
+        if self._snapshot is None or self._snapshot.version != self.version:
+            self._snapshot = ScoreboardSnapshot(self.version, dict(self.scoreboard))
+        return self._snapshot
+
+    # Save a snapshot of the scoreboard to a file. Saves the current scoreboard if no snapshot is given.
+    # Can be called from a background thread only if a snapshot taken on the event loop is given.
+    # Snapshots older than the last saved one are skipped.
+    def save(self, snapshot: Optional[ScoreboardSnapshot] = None):
+        snapshot = snapshot or self.snapshot()
+
+        with self._save_lock:
+            if snapshot.version < self._saved_version:
+                logger.debug(f'Scoreboard version {snapshot.version} is older than the saved version. Skipping save.')
+                return
+            logger.info(f'Saving scoreboard to "{self.FILENAME}"')
+
+            with open(f'{self.FILENAME}.tmp', 'w', newline='') as _file:
+                _writer = csv.writer(_file, delimiter=' ', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+                _writer.writerow((["Username", "Luck", "Tier", "Lifetime", "Since last win", "ID"]))
+                for user in snapshot.users.values():
+                    _writer.writerow([user.name, user.luck, user.tier, user.lifetime, user.since_last_win, user.id])
+            os.replace(f'{self.FILENAME}.tmp', self.FILENAME)
+            self._saved_version = snapshot.version
 
     # Gets a user from the scoreboard.
     def getuser(self, name: str) -> User:
         return self.scoreboard[name]
 
+    # Replaces a user in the scoreboard and bumps the version.
+    def _setuser(self, name: str, user: User) -> None:
+        self.scoreboard[name] = user
+        self.version += 1
+
     # Reset the luck of a user to 0
     def reset(self, name: str) -> None:
         logger.info(f'Reseting {name} to 0 luck and 0 giveaways since last win.')
-        self.scoreboard[name].luck = 0
-        self.scoreboard[name].since_last_win = 0
+        user = self.getuser(name).copy()
+        user.luck = 0
+        user.since_last_win = 0
+        self._setuser(name, user)
 
     # Punishes a user for participating in a giveaway without being able to claim the price.
     # Used to combat luck farming
     def punish(self, name: str) -> None:
         logger.info(f'Punishing {name} for not claiming giveaway prize. '
                     f'Decreasing current luck by {self.SKIP_PUNISHMENT}%.')
-        user = self.getuser(name)
+        user = self.getuser(name).copy()
         logger.debug(f'{name} had {user.luck}.')
-        self.scoreboard[name].luck = int(user.luck * ((100 - self.SKIP_PUNISHMENT) / 100))
+        user.luck = int(user.luck * ((100 - self.SKIP_PUNISHMENT) / 100))
+        self._setuser(name, user)
         logger.debug(f'{name} now has {user.luck}.')
 
     # Adds a user to the scoreboard. This is only called when a user is added to a giveaway.
@@ -178,19 +273,19 @@ class Scoreboard:
     def add(self, name: str) -> None:
         logger.info(f"Adding user {name}.")
         if name in self.scoreboard:
-            user = self.scoreboard.get(name)
+            user = self.getuser(name).copy()
             user.luck += self.LUCK_BUMP
             user.lifetime += 1
             user.since_last_win += 1
             if not user.id:
                 user.id = self.API.getuserid(name)
             user.tier = self.getusertier(user.id)
-            self.scoreboard[name] = user
+            self._setuser(name, user)
         else:
             user = User(name, luck=self.LUCK_BUMP, tier=0, lifetime=1, since_last_win=1, userid='')
             user.id = self.API.getuserid(name)
             user.tier = self.getusertier(user.id)
-            self.scoreboard[name] = user
+            self._setuser(name, user)
 
     # Gets subscription tier from a user id.
     # Returns an int with that tiers luck
@@ -209,13 +304,15 @@ class Scoreboard:
     def bump(self, name: str, points: int) -> None:
         if name in self.scoreboard:
             logger.info(f'Bumping score for user {name} with {points}')
-            self.scoreboard[name].luck += (points * self.LUCK_BUMP)
+            user = self.getuser(name).copy()
+            user.luck += (points * self.LUCK_BUMP)
+            self._setuser(name, user)
         else:
             logger.warning(f'{name} is not in the scoreboard. Ignoring bump.')
 
     # Returns a users stats: current luck, sub tier, lifetime participation's and amount of giveaways since last win.
     def user_stats(self, name: str) -> [int, int, int, int]:
-        user = self.getuser(name)
+        user = self.scoreboard.get(name)
         if user:
             return [int(user.luck / self.LUCK_BUMP), int(user.tier / 10), user.lifetime, user.since_last_win]
         else:
@@ -226,39 +323,48 @@ class Scoreboard:
 class Giveaway:
     scoreboard: Scoreboard
     IGNORE_LIST: IgnoreList
+    HISTORY: GiveawayHistory
     LUCK_BUMP: int
     opened: bool
     winner: str
     winner_roll: int
     winner_giveaways: int
-    participants: Dict[str, User]
+    giveaway_id: int
+    draws: int
+    winner_row: Optional[Dict]
+    history_rows: List[Dict]
 
     def __init__(self, scoreboard: Scoreboard, luck_bump: int) -> None:
         self.scoreboard = scoreboard
         self.IGNORE_LIST = IgnoreList()
         self.IGNORE_LIST.load()
+        self.HISTORY = GiveawayHistory()
 
         self.LUCK_BUMP = luck_bump
         self.opened = False
         self.winner = ""
         self.winner_roll = 0
         self.winner_giveaways = 0
-        self.participants = {}
-        self._lock = asyncio.Lock()
-
-    # Opens the giveaway. Loads the scoreboard from file and clears values from last giveaway.
+        self._participants = set()
+        self._participants_snapshot = None
+        self.giveaway_id = 0
+        self.draws = 0
+        self.winner_row = None
+        self.history_rows = []
+
+    # Opens the giveaway and clears values from last giveaway.
+    # The caller is responsible for confirming the last winner and loading the scoreboard from file.
     def open(self) -> None:
         if not self.opened:
-            if self.winner:
-                self.confirm_winner()
-                logger.debug(f'Winner was not manually confirmed in last giveaway.'
-                             f' Last winner automatically confirmed.')
-            self.scoreboard.load()
             self.opened = True
             self.winner = ""
             self.winner_roll = 0
             self.winner_giveaways = 0
-            self.participants = {}
+            self._participants = set()
+            self._participants_snapshot = None
+            self.giveaway_id = int(time.time())
+            self.draws = 0
+            self.winner_row = None
             logger.info('Giveaway is opened')
 
     # Re-opens the giveaway without drawing a winner
@@ -268,9 +374,9 @@ class Giveaway:
             logger.info('Giveaway is re-opened')
 
     # Closes the giveaway and prepares for draw.
+    # Does not save the scoreboard, the caller saves a snapshot so joins are not blocked by the save.
     def close(self) -> None:
         if self.opened:
-            self.scoreboard.save()
             self.opened = False
             logger.info('Giveaway is closed')
             logger.debug(f'Participants: {self.participants}')
@@ -288,24 +394,58 @@ class Giveaway:
         # If draw() is called and there is already a winner the last winner gets punished for not claiming their prize.
         if self.winner:
             self.scoreboard.punish(self.winner)
+            self.record_outcome(history.SKIPPED)
 
         results: Dict[str, int] = {}
+        rows: Dict[str, Dict] = {}
+        self.draws += 1
 
-        for name, user in self.participants.items():
+        users = self.scoreboard.snapshot().users
+        for name in self.participants:
+            user = users[name]
             results[name] = random.randint(1, 1000) + user.luck + user.tier
+            rows[name] = {'giveaway': self.giveaway_id, 'draw': self.draws, 'user': name, 'roll': results[name],
+                          'luck': user.luck, 'tier': user.tier, 'since_last_win': user.since_last_win,
+                          'outcome': history.LOST}
 
         self.winner = max(results, key=results.get)
         self.winner_roll = results[self.winner]
         self.winner_giveaways = int(self.scoreboard.getuser(self.winner).since_last_win)
+        rows[self.winner]['outcome'] = history.WON
+        self.winner_row = rows[self.winner]
+        self.history_rows.extend(rows.values())
 
         logger.debug(f"Drawing winner... Winner is {self.winner} that won with a value of: {self.winner_roll}")
 
-        self.participants.pop(self.winner)
+        self._participants.discard(self.winner)
+        self._participants_snapshot = None
 
-    # Confirms the winner of the last giveaway. Resets the luck of the winner and saves the scoreboard.
-    def confirm_winner(self) -> None:
+    # Confirms the winner of the last giveaway. Resets the luck of the winner.
+    # The caller is responsible for saving the scoreboard.
+    # auto is used when the winner is confirmed by opening a new giveaway instead of with !confirm.
+    def confirm_winner(self, auto: bool = False) -> None:
         self.scoreboard.reset(self.winner)
-        self.scoreboard.save()
+        self.record_outcome(history.AUTO_CONFIRMED if auto else history.CONFIRMED)
+
+    # Adds the outcome for the winner of the last draw to the rows waiting for the giveaway history.
+    # Only the first outcome is recorded, eg. a winner confirmed twice is only confirmed once.
+    def record_outcome(self, outcome: int) -> None:
+        if self.winner_row:
+            self.history_rows.append({**self.winner_row, 'outcome': outcome})
+            self.winner_row = None
+
+    # Returns the rows waiting to be written to the giveaway history and clears them.
+    def take_history_rows(self) -> List[Dict]:
+        rows = self.history_rows
+        self.history_rows = []
+        return rows
+
+    # Returns an immutable snapshot of the participants. A new snapshot is only made if someone joined or won.
+    @property
+    def participants(self) -> FrozenSet[str]:
+        if self._participants_snapshot is None:
+            self._participants_snapshot = frozenset(self._participants)
+        return self._participants_snapshot
 
     # Adds a user to the giveaway and to the scoreboard.
     # Checks if a giveaway is opened, if the user is already in the giveaway and if the name is on the ignorelist
@@ -315,7 +455,7 @@ class Giveaway:
         if not self.opened:
             logger.warning(f'Giveaway is not opened!')
             return
-        if name in self.participants:
+        if name in self._participants:
             logger.info(f'{name} is already in giveaway.')
             return
         if name in self.IGNORE_LIST:
@@ -325,12 +465,13 @@ class Giveaway:
         logger.debug(f"Adding {name} to giveaway.")
 
         self.scoreboard.add(name)
-        self.participants[name] = self.scoreboard.getuser(name)
+        self._participants.add(name)
+        self._participants_snapshot = None
         logger.debug(f'{name} added to giveaway.')
 
     # Returns if the user is in the current giveaway or not.
     def is_participating(self, name) -> bool:
-        return name in self.participants
+        return name in self._participants
 
 
 class Bot(commands.Bot):
@@ -353,7 +494,7 @@ class Bot(commands.Bot):
     # Init for the bot. Reads the config file and sets all values
     def __init__(self):
         config = configparser.ConfigParser()
-        config.read('settings.ini')
+        config.read(SETTINGS_FILENAME)
 
         self.TMI_TOKEN = config['bot']['TMI_TOKEN']
         self.ACCESS_TOKEN = config['bot']['ACCESS_TOKEN']
@@ -369,7 +510,7 @@ class Bot(commands.Bot):
             self.BROADCAST_ID = str(apihandler.APIHandler.getuseridstatic(accessToken=self.ACCESS_TOKEN,
                                                                           clientid=self.CLIENT_ID,
                                                                           name=self.CHANNEL))
-            config['bot']['BROADCAST_ID'] = self.BROADCAST_ID
+            save_setting('bot', 'BROADCAST_ID', self.BROADCAST_ID)
 
         self.scoreboard = Scoreboard(bump=config['giveaway'].getint('LUCK_BUMP', fallback=10),
                                      tier1=config['giveaway'].getint('TIER1_LUCK', fallback=300),
@@ -378,13 +519,14 @@ class Bot(commands.Bot):
                                      skip_punishment=config['giveaway'].getint('SKIP_PUNISHMENT', fallback=50),
                                      api=apihandler.APIHandler(clientID=self.CLIENT_ID,
                                                                accessToken=self.ACCESS_TOKEN,
-                                                               broadcasterID=self.BROADCAST_ID))
+                                                               broadcasterID=self.BROADCAST_ID,
+                                                               validate=False))
 
         self.CASE_SENSITIVE = config['giveaway'].getboolean('CASE_SENSITIVE', fallback=True)
         self.REMINDER_ENABLED = config['giveaway'].getboolean('REMINDER_ENABLED', fallback=False)
         self.REMINDER_TIME = config['giveaway'].getint('REMINDER_DELAY', fallback=300)
         self.giveaway_word = ''
-        self.giveaway = None
+        self.giveaway = Giveaway(scoreboard=self.scoreboard, luck_bump=self.scoreboard.LUCK_BUMP)
         self.blacklist = None
 
         self._lock = asyncio.Lock()
@@ -396,6 +538,57 @@ class Bot(commands.Bot):
             initial_channels=[self.CHANNEL],
         )
 
+        # Validate the token and load the scoreboard in the background while the bot connects to chat.
+        # The first !open uses this load instead of reading the scoreboard again.
+        self.token_validated = self.loop.create_task(self.validate_token())
+        self.scoreboard_loaded = self.loop.create_task(self.read_scoreboard())
+        self.scoreboard_fresh = True
+
+    # Checks the access token without blocking the IRC connection. Stops the bot if the token is invalid.
+    # Network errors are retried, if the token still can't be checked the bot keeps running.
+    # Returns if the token is valid.
+    async def validate_token(self) -> bool:
+        for attempt in range(1, TOKEN_CHECK_ATTEMPTS + 1):
+            try:
+                await self.loop.run_in_executor(None, self.scoreboard.API.checkaccesstoken)
+                return True
+            except RuntimeError as e:
+                logger.critical(f'{e}')
+                self.loop.stop()
+                return False
+            except requests.exceptions.RequestException as e:
+                logger.warning(f'Could not reach twitch to check the access token '
+                               f'(attempt {attempt}/{TOKEN_CHECK_ATTEMPTS}): {e}')
+                if attempt < TOKEN_CHECK_ATTEMPTS:
+                    await asyncio.sleep(TOKEN_CHECK_RETRY_DELAY)
+
+        logger.warning('Access token could not be checked. Continuing without checking it.')
+        return True
+
+    # Reads the scoreboard file in a background thread and swaps it in on the event loop.
+    async def read_scoreboard(self) -> None:
+        scoreboard = await self.loop.run_in_executor(None, self.scoreboard.read)
+        if scoreboard is not None:
+            self.scoreboard.replace(scoreboard)
+
+    # Loads the scoreboard from file without blocking the bot.
+    # Skips the load if the scoreboard was just loaded on startup.
+    async def load_scoreboard(self) -> None:
+        await self.scoreboard_loaded
+        if self.scoreboard_fresh:
+            self.scoreboard_fresh = False
+        else:
+            self.scoreboard_loaded = self.loop.create_task(self.read_scoreboard())
+            await self.scoreboard_loaded
+
+    # Saves a snapshot of the scoreboard without blocking the bot.
+    async def save_scoreboard(self) -> None:
+        await self.loop.run_in_executor(None, self.scoreboard.save, self.scoreboard.snapshot())
+
+    # Writes the giveaway rows from the last draw or confirm to the history without blocking the bot.
+    async def save_history(self) -> None:
+        await self.loop.run_in_executor(None, self.giveaway.HISTORY.append, self.giveaway.take_history_rows())
+
     # Sends a reminder message every REMINDER_TIME seconds when a giveaway is opened.
     async def giveaway_reminder(self):
         channel = bot.get_channel(self.CHANNEL)
@@ -418,8 +611,6 @@ class Bot(commands.Bot):
 
     # Triggers when the bot is ready
     async def event_ready(self) -> None:
-        self.giveaway = Giveaway(scoreboard=self.scoreboard, luck_bump=self.scoreboard.LUCK_BUMP)
-        self.scoreboard.load()
         logger.info(f'Bot {self.nick} ready')
         asyncio.get_event_loop().create_task(bot.get_channel(self.CHANNEL).send_me(f'I am ready for action!'))
 
@@ -446,7 +637,18 @@ class Bot(commands.Bot):
         if self.is_admin(ctx.author):
             async with self._lock:
                 logger.info('!open-ing giveaway')
+                if not await self.token_validated:
+                    logger.warning("Can't open giveaway: Access token is not valid")
+                    await ctx.send_me("Can't open giveaway: The access token is not valid!")
+                    return
                 if not self.giveaway.opened:
+                    if self.giveaway.winner:
+                        self.giveaway.confirm_winner(auto=True)
+                        logger.debug(f'Winner was not manually confirmed in last giveaway.'
+                                     f' Last winner automatically confirmed.')
+                        await self.save_scoreboard()
+                        await self.save_history()
+                    await self.load_scoreboard()
                     if self.REMINDER_ENABLED:
                         try:
                             logger.debug("Creating reminder task.")
@@ -491,6 +693,7 @@ class Bot(commands.Bot):
                         logger.debug("Cancelling reminder task.")
                         self.reminder_task.cancel()
                     self.giveaway.close()
+                    await self.save_scoreboard()
                     await ctx.send_me(f'== Giveaway is closed == Pick the winner')
 
     # If the giveaway is closed, draw a winner and present them.
@@ -502,6 +705,7 @@ class Bot(commands.Bot):
                 self.giveaway_word = '' # Clears the giveaway word to avoid weird effects
                 logger.info('!winner')
                 self.giveaway.draw()
+                await self.save_history()
                 winner_name = self.giveaway.winner
                 if winner_name:
                     await ctx.send_me(f'== The winner is @{winner_name} == '
@@ -520,6 +724,8 @@ class Bot(commands.Bot):
                 if self.giveaway.winner:
                     logger.info('!confirm-ing winner.')
                     self.giveaway.confirm_winner()
+                    await self.save_scoreboard()
+                    await self.save_history()
                     await ctx.send_me(f'{self.giveaway.winner} has been confirmed as winner!')
                 else:
                     logger.warning('No winner has been selected yet. Please draw a winner first.')
@@ -537,12 +743,12 @@ class Bot(commands.Bot):
     @commands.command(name='scoreboard', aliases=['sb'])
     async def scoreboard_command(self, ctx) -> None:
         if self.is_admin(ctx.author):
-            async with self._lock:
-                logger.info('!scoreboard')
-                logger.info('Scoreboard:')
-                logger.info('Name Luck Tier')
-                for name, user in self.giveaway.participants.items():
-                    logger.info(f'Name: {name} Luck: {user.luck} Tier: {user.tier}')
+            logger.info('!scoreboard')
+            logger.info('Scoreboard:')
+            logger.info('Name Luck Tier')
+            for name in self.giveaway.participants:
+                user = self.scoreboard.getuser(name)
+                logger.info(f'Name: {name} Luck: {user.luck} Tier: {user.tier}')
 
     # Prints the ignorelist in the bot console
     @commands.command(name='ignorelist')
@@ -596,6 +802,7 @@ class Bot(commands.Bot):
     # Gets the stats for a user and presents them in chat
     @commands.command(name='stats', aliases=['lucky', 'howlucky'])
     async def luck_command(self, ctx) -> None:
+        await self.scoreboard_loaded
         user_stats = self.scoreboard.user_stats(ctx.author.name.lower())
         if user_stats:
             await ctx.send_me(f'{ctx.author.name} has a current luck of {user_stats[0]}% '
@@ -613,6 +820,7 @@ class Bot(commands.Bot):
         if self.is_admin(ctx.author):
             _, user, luck, *_ = ctx.content.split(' ')
             if user and luck:
+                await self.scoreboard_loaded
                 logger.info(f'Trying to bump{user[1:].lower()} by {luck}')
                 self.scoreboard.bump(user[1:].lower(), int(luck))
 
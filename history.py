@@ -0,0 +1,164 @@
+import os
+import logging
+import threading
+from array import array
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Outcomes stored in the outcome column.
+# LOST and WON rows are written for every participant when a draw happens.
+# CONFIRMED, SKIPPED and AUTO_CONFIRMED rows are appended later for the winner of that draw.
+LOST = 0
+WON = 1
+CONFIRMED = 2
+AUTO_CONFIRMED = 3
+SKIPPED = 4
+
+# Column name -> array typecode. Every column is stored in its own append-only file.
+COLUMNS = {
+    'giveaway': 'q',        # Time the giveaway was opened, used as giveaway id
+    'draw': 'i',            # Draw number within the giveaway
+    'user': 'i',            # Index into the names file
+    'roll': 'i',            # Total roll: dice + luck + tier
+    'luck': 'i',            # Luck at draw time
+    'tier': 'i',            # Subscriber luck at draw time
+    'since_last_win': 'i',  # Giveaways since last win at draw time
+    'outcome': 'b',         # One of the outcomes above
+}
+
+
+# Append-only columnar history of every draw. Each participant in a draw is one row,
+# and every later outcome for the winner of a draw is another row.
+# Names are stored once in a separate file and referenced by index from the user column.
+class GiveawayHistory:
+    DIRECTORY: str
+    names: List[str]
+    name_index: Dict[str, int]
+
+    def __init__(self, directory: str = None):
+        self.DIRECTORY = directory or 'history'
+        self.names = []
+        self.name_index = {}
+        self._names_loaded = False
+        self._lock = threading.Lock()
+
+    def _path(self, column: str) -> str:
+        return os.path.join(self.DIRECTORY, f'{column}.bin')
+
+    # Loads the names file. Only needed once, the names are kept in memory after that.
+    def _load_names(self) -> None:
+        if self._names_loaded:
+            return
+        filename = os.path.join(self.DIRECTORY, 'names.txt')
+        if os.path.isfile(filename):
+            with open(filename, 'r') as _file:
+                self.names = [line.rstrip('\n') for line in _file]
+            self.name_index = {name: i for i, name in enumerate(self.names)}
+        self._names_loaded = True
+
+    # Returns the index of a name, adding it to the names file if it is new.
+    def _userindex(self, name: str) -> int:
+        if name not in self.name_index:
+            with open(os.path.join(self.DIRECTORY, 'names.txt'), 'a') as _file:
+                _file.write(f'{name}\n')
+            self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return self.name_index[name]
+
+    # Appends rows to the history. Each row is a dict with the keys in COLUMNS, except user is a name.
+    # Can be called from a background thread.
+    def append(self, rows: List[Dict]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            logger.info(f'Appending {len(rows)} rows to giveaway history.')
+            os.makedirs(self.DIRECTORY, exist_ok=True)
+            self._load_names()
+
+            users = [self._userindex(row['user']) for row in rows]
+
+            self._repair()
+            for column, typecode in COLUMNS.items():
+                values = users if column == 'user' else (row[column] for row in rows)
+                with open(self._path(column), 'ab') as _file:
+                    array(typecode, values).tofile(_file)
+
+    # Cuts every column file back to the shortest one so they line up again
+    # if the bot crashed while appending.
+    def _repair(self) -> None:
+        sizes = {column: os.path.getsize(self._path(column)) if os.path.isfile(self._path(column)) else 0
+                 for column in COLUMNS}
+        length = min(sizes[column] // array(typecode).itemsize for column, typecode in COLUMNS.items())
+
+        for column, typecode in COLUMNS.items():
+            if sizes[column] != length * array(typecode).itemsize:
+                logger.warning(f'Giveaway history column "{column}" does not match the other columns. '
+                               f'Cutting it back to {length} rows.')
+                with open(self._path(column), 'r+b') as _file:
+                    _file.truncate(length * array(typecode).itemsize)
+
+    # Reads the given columns into arrays. If a column file is longer than the others or ends
+    # with a partly written value (eg. the bot crashed while appending) the extra data is ignored.
+    def columns(self, *names: str) -> Dict[str, array]:
+        result = {}
+        for column in names:
+            data = array(COLUMNS[column])
+            if os.path.isfile(self._path(column)):
+                with open(self._path(column), 'rb') as _file:
+                    raw = _file.read()
+                data.frombytes(raw[:len(raw) - len(raw) % data.itemsize])
+            result[column] = data
+
+        length = min(len(data) for data in result.values()) if result else 0
+        for column, data in result.items():
+            if len(data) > length:
+                del data[length:]
+        return result
+
+    # Returns the row numbers of every row with the given outcome.
+    # The outcome column is one byte per row, so this searches the raw bytes instead of every row.
+    def _rows_with(self, outcome: int) -> List[int]:
+        filename = self._path('outcome')
+        if not os.path.isfile(filename):
+            return []
+        with open(filename, 'rb') as _file:
+            data = _file.read()
+        needle = bytes([outcome])
+        rows = []
+        i = data.find(needle)
+        while i != -1:
+            rows.append(i)
+            i = data.find(needle, i + 1)
+        return rows
+
+    # Returns the average amount of giveaways it took to win, grouped by subscriber luck.
+    # Only confirmed wins in giveaways opened after the since timestamp are counted.
+    # Wins confirmed automatically by opening a new giveaway are counted unless include_auto is False.
+    def average_giveaways_to_win(self, since: float = 0, include_auto: bool = True) -> Dict[int, float]:
+        data = self.columns('giveaway', 'tier', 'since_last_win')
+        rows = self._rows_with(CONFIRMED)
+        if include_auto:
+            rows += self._rows_with(AUTO_CONFIRMED)
+
+        totals: Dict[int, Tuple[int, int]] = {}
+        for row in rows:
+            if row >= len(data['giveaway']) or data['giveaway'][row] < since:
+                continue
+            tier = data['tier'][row]
+            total, count = totals.get(tier, (0, 0))
+            totals[tier] = (total + data['since_last_win'][row], count + 1)
+        return {tier: total / count for tier, (total, count) in totals.items()}
+
+    # Returns the names of users who won a draw but never confirmed it.
+    # Winners that were skipped, automatically confirmed or are still waiting for !confirm are included.
+    def unconfirmed_winners(self, since: float = 0) -> Set[str]:
+        data = self.columns('giveaway', 'draw', 'user')
+        self._load_names()
+
+        def draws(outcome: int) -> Set[Tuple[int, int, int]]:
+            return {(data['giveaway'][row], data['draw'][row], data['user'][row])
+                    for row in self._rows_with(outcome)
+                    if row < len(data['giveaway']) and data['giveaway'][row] >= since}
+
+        return {self.names[user] for _, _, user in draws(WON) - draws(CONFIRMED)}